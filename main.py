@@ -14,7 +14,7 @@ import argparse
 import time
 from pathlib import Path
 from colorama import Fore, Style, init
-from typing import Optional
+from typing import Mapping, Optional
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -164,7 +164,7 @@ def get_user_query(non_interactive: bool = False, default_query: Optional[str] =
 
 
 def process_batch(
-    files_batch: dict,
+    files_batch: Mapping[str, str],
     analyzer: CodeAnalyzer,
     ai_engine: AIEngine,
     change_detector: ChangeDetector,
@@ -229,11 +229,23 @@ def process_batch(
         if filename not in change_results or filename not in ai_results:
             continue
         
+        # Each file is assessed once per run, so the digest only pays off
+        # when assessments persist across runs
+        input_digest = None
+        if risk_assessor.cache_dir:
+            input_digest = RiskAssessor.input_digest(
+                filename,
+                files_batch[filename],
+                ai_results[filename]['modified_code'],
+                ai_results[filename]['changes_made']
+            )
+        
         assessment = risk_assessor.assess_risk(
             filename=filename,
             original_analysis=analysis_results[filename],
             change_stats=change_results[filename]['statistics'],
-            ai_changes=ai_results[filename]['changes_made']
+            ai_changes=ai_results[filename]['changes_made'],
+            input_digest=input_digest
         )
         risk_assessments[filename] = assessment
     
@@ -2,15 +2,26 @@
 File ingestion and parsing module
 Enhanced with project-level ingestion and .gitignore support
 """
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from importlib.metadata import files
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Set
 import ast
-import fnmatch
+import mmap
 import os
+import pathspec
 
 SUPPORTED_EXTENSIONS = {".py", ".js", ".java", ".ts"}
 
+# Files larger than this are read through a memory map (NEW)
+MMAP_THRESHOLD = 64 * 1024
+
+# Maximum number of parsed ASTs kept in memory; others are reparsed on demand (NEW)
+MAX_CACHED_ASTS = 64
+
 
 # Import with proper type checking
 try:
@@ -20,7 +31,7 @@ try:
 except ImportError:
     UTILS_AVAILABLE = False
     # Fallback stubs with proper signatures
-    def extract_text_from_pdf(pdf_path: Path) -> Optional[str]:
+    def extract_text_from_pdf(pdf_path: Path, max_workers: Optional[int] = None) -> Optional[str]:
         """Fallback stub for PDF extraction."""
         return None
     
@@ -33,6 +44,34 @@ except ImportError:
         return None
 
 
+def _read_source_file(file_path: Path) -> str:
+    """
+    Read a UTF-8 source file, memory-mapping it when it is large.
+    
+    Large files are decoded straight from the mapped pages instead of
+    first being copied into an intermediate bytes object.
+    
+    Args:
+        file_path: Path to the source file
+        
+    Returns:
+        Decoded source code with newlines normalized to \\n
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                source_code = str(mm, 'utf-8')
+        else:
+            source_code = f.read().decode('utf-8')
+    
+    # Match text-mode universal newline handling
+    if '\r' in source_code:
+        source_code = source_code.replace('\r\n', '\n').replace('\r', '\n')
+    
+    return source_code
+
+
 class FileIngestion:
     """Handles ingestion of Python source files and supporting documents."""
     
@@ -64,14 +103,15 @@ class FileIngestion:
         
         # Initialize storage
         self.python_files: Dict[str, str] = {}
-        self.python_asts: Dict[str, ast.Module] = {}
+        self.python_asts: "OrderedDict[str, ast.Module]" = OrderedDict()  # LRU (NEW)
+        self.max_cached_asts = MAX_CACHED_ASTS
         self.documents: Dict[str, str] = {}
         self.file_paths: Dict[str, Path] = {}  # Track original paths (NEW)
         self.file_languages: Dict[str, str] = {}
 
         
         # Setup ignore patterns (NEW)
-        self.ignore_patterns = ignore_patterns or []
+        self.ignore_patterns = list(ignore_patterns or [])
         self._load_gitignore()
     
     def _load_gitignore(self) -> None:
@@ -86,23 +126,20 @@ class FileIngestion:
                             self.ignore_patterns.append(line)
             except Exception as e:
                 print(f"Warning: Could not read .gitignore: {e}")
+        
+        # Compile all patterns into a single matcher once
+        self._pathspec = pathspec.GitIgnoreSpec.from_lines(self.ignore_patterns)
     
     def _should_ignore(self, path: Path) -> bool:
         """Check if path should be ignored based on patterns (NEW)."""
-        path_str = str(path)
-        
-        # Check against ignore patterns
-        for pattern in self.ignore_patterns:
-            if fnmatch.fnmatch(path_str, pattern) or \
-               fnmatch.fnmatch(path.name, pattern):
-                return True
-            
-            # Check directory patterns
-            for part in path.parts:
-                if fnmatch.fnmatch(part, pattern):
-                    return True
+        try:
+            relative = path.relative_to(self.project_root).as_posix()
+        except ValueError:
+            # Outside the project root (e.g. a separate docs directory):
+            # match on the path components without the anchor
+            relative = Path(*path.parts[1:]).as_posix() if path.anchor else path.as_posix()
         
-        return False
+        return self._pathspec.match_file(relative)
     
     def _is_file_too_large(self, file_path: Path) -> bool:
         """Check if file exceeds size limit (NEW)."""
@@ -147,8 +184,7 @@ class FileIngestion:
                 continue
         
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    source_code = f.read()
+                source_code = _read_source_file(file_path)
             
                 # Use relative path as key for better organization
                 relative_path = file_path.relative_to(self.code_dir) if self.recursive else file_path.name
@@ -161,7 +197,7 @@ class FileIngestion:
                 if file_path.suffix == '.py':
                     try:
                         parsed_ast = ast.parse(source_code, filename=str(file_path))
-                        self.python_asts[key] = parsed_ast
+                        self._cache_ast(key, parsed_ast)
                     except SyntaxError as e:
                         print(f"⚠ Syntax error in {key}: {e}")
                         continue
@@ -193,27 +229,7 @@ class FileIngestion:
         """
         from modules.language_registry import is_supported_file
     
-        if depth > max_depth:
-            return []
-    
-        files: List[Path] = []
-    
-        try:
-            for item in directory.iterdir():
-                # Skip ignored items
-                if self._should_ignore(item):
-                    continue
-            
-                if item.is_file() and is_supported_file(item.name):
-                    files.append(item)
-                elif item.is_dir():
-                    files.extend(
-                        self._find_files_recursive(item, depth + 1, max_depth)
-                    )
-        except PermissionError:
-            print(f"⚠ Permission denied: {directory}")
-    
-        return files
+        return self._walk_files(directory, is_supported_file, depth, max_depth)
 
 
     def _find_python_files_recursive(
@@ -233,27 +249,61 @@ class FileIngestion:
         Returns:
             List of Python file paths
         """
-        if depth > max_depth:
-            return []
+        return self._walk_files(
+            directory,
+            lambda name: os.path.splitext(name)[1] in SUPPORTED_EXTENSIONS,
+            depth,
+            max_depth
+        )
+    
+    def _walk_files(
+        self,
+        directory: Path,
+        accept: Callable[[str], bool],
+        depth: int = 0,
+        max_depth: int = 10
+    ) -> List[Path]:
+        """
+        Walk a directory tree with os.scandir, collecting accepted files.
         
-        py_files: List[Path] = []
+        DirEntry caches the file type from readdir, so no extra stat()
+        is needed per entry; an explicit stack replaces recursion.
         
-        try:
-            for item in directory.iterdir():
-                # Skip ignored items
-                if self._should_ignore(item):
-                    continue
-                
-                if item.is_file() and item.suffix in SUPPORTED_EXTENSIONS:
-                    py_files.append(item)
-                elif item.is_dir():
-                    py_files.extend(
-                        self._find_python_files_recursive(item, depth + 1, max_depth)
-                    )
-        except PermissionError:
-            print(f"⚠ Permission denied: {directory}")
+        Args:
+            directory: Directory to search
+            accept: Predicate on the file name
+            depth: Depth of the starting directory
+            max_depth: Maximum recursion depth
+            
+        Returns:
+            List of file paths
+        """
+        files: List[Path] = []
+        stack = [(str(directory), depth)]
+        
+        while stack:
+            current, current_depth = stack.pop()
+            if current_depth > max_depth:
+                continue
+            
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        path = Path(entry.path)
+                        
+                        # Skip ignored items
+                        if self._should_ignore(path):
+                            continue
+                        
+                        if entry.is_file(follow_symlinks=False):
+                            if accept(entry.name):
+                                files.append(path)
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, current_depth + 1))
+            except PermissionError:
+                print(f"⚠ Permission denied: {current}")
         
-        return py_files
+        return files
     
     def ingest_documents(self) -> int:
         """
@@ -274,12 +324,22 @@ class FileIngestion:
             txt_files = list(self.docs_dir.glob("*.txt"))
             md_files = list(self.docs_dir.glob("*.md"))
         
-        # Process PDFs
-        for pdf_file in pdf_files:
-            if self._should_ignore(pdf_file) or self._is_file_too_large(pdf_file):
-                continue
-            
-            text = extract_text_from_pdf(pdf_file)
+        # Process PDFs (CPU-bound, so extract in parallel when there are several)
+        pdf_files = [
+            pdf_file for pdf_file in pdf_files
+            if not (self._should_ignore(pdf_file) or self._is_file_too_large(pdf_file))
+        ]
+        
+        if len(pdf_files) > 1:
+            # One level of parallelism: files across the pool, and each worker
+            # extracts its file's pages serially (no nested page-range pools)
+            extract_serially = partial(extract_text_from_pdf, max_workers=1)
+            with ProcessPoolExecutor() as pool:
+                pdf_texts = list(pool.map(extract_serially, pdf_files))
+        else:
+            pdf_texts = [extract_text_from_pdf(pdf_file) for pdf_file in pdf_files]
+        
+        for pdf_file, text in zip(pdf_files, pdf_texts):
             if text:
                 key = str(pdf_file.relative_to(self.docs_dir)) if self.recursive else pdf_file.name
                 self.documents[key] = text
@@ -303,20 +363,48 @@ class FileIngestion:
         return self.python_files.get(filename)
     
     def get_ast(self, filename: str) -> Optional[ast.Module]:
-        """Get AST for a specific file."""
-        return self.python_asts.get(filename)
+        """
+        Get AST for a specific file.
+        
+        Recently used ASTs are served from a bounded LRU cache; evicted or
+        cleared entries are reparsed from the ingested source.
+        """
+        tree = self.python_asts.get(filename)
+        if tree is not None:
+            self.python_asts.move_to_end(filename)
+            return tree
+        
+        source_code = self.python_files.get(filename)
+        file_path = self.file_paths.get(filename)
+        if source_code is None or file_path is None or file_path.suffix != '.py':
+            return None
+        
+        try:
+            tree = ast.parse(source_code, filename=str(file_path))
+        except SyntaxError:
+            return None
+        
+        self._cache_ast(filename, tree)
+        return tree
+    
+    def _cache_ast(self, filename: str, tree: ast.Module) -> None:
+        """Insert an AST into the LRU cache, evicting the oldest entries (NEW)."""
+        self.python_asts[filename] = tree
+        self.python_asts.move_to_end(filename)
+        while len(self.python_asts) > self.max_cached_asts:
+            self.python_asts.popitem(last=False)
     
     def get_file_path(self, filename: str) -> Optional[Path]:
         """Get original file path (NEW)."""
         return self.file_paths.get(filename)
     
-    def get_all_source_files(self) -> Dict[str, str]:
-        """Get all ingested source code files."""
-        return self.python_files.copy()
+    def get_all_source_files(self) -> Mapping[str, str]:
+        """Get all ingested source code files (read-only view, not a copy)."""
+        return MappingProxyType(self.python_files)
     
-    def get_all_documents(self) -> Dict[str, str]:
-        """Get all ingested documents."""
-        return self.documents.copy()
+    def get_all_documents(self) -> Mapping[str, str]:
+        """Get all ingested documents (read-only view, not a copy)."""
+        return MappingProxyType(self.documents)
     
     def get_summary(self) -> Dict:
         """Get ingestion summary."""
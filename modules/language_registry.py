@@ -2,41 +2,73 @@
 Language handler registry for IRMS
 Maps file extensions to appropriate language handlers
 """
-from typing import Dict, Optional
+import importlib
+import os
+from typing import Dict, Optional, Tuple
 from modules.languages.base import BaseLanguageHandler
-from modules.languages.python_handler import PythonHandler
-from modules.languages.java_handler import JavaHandler
-from modules.languages.cpp_handler import CppHandler
-from modules.languages.javascript_handler import JavaScriptHandler
 
 
+# Handler (module, class) per language; imported and instantiated on
+# first use so unused languages cost nothing at import time
+_PYTHON = ("modules.languages.python_handler", "PythonHandler")
+_JAVA = ("modules.languages.java_handler", "JavaHandler")
+_CPP = ("modules.languages.cpp_handler", "CppHandler")
+_JAVASCRIPT = ("modules.languages.javascript_handler", "JavaScriptHandler")
+
 # Register all language handlers
-LANGUAGE_HANDLERS: Dict[str, BaseLanguageHandler] = {
+LANGUAGE_HANDLERS: Dict[str, Tuple[str, str]] = {
     # Python
-    ".py": PythonHandler(),
+    ".py": _PYTHON,
     
     # Java
-    ".java": JavaHandler(),
+    ".java": _JAVA,
     
     # C/C++
-    ".c": CppHandler(),
-    ".cpp": CppHandler(),
-    ".cc": CppHandler(),
-    ".cxx": CppHandler(),
-    ".h": CppHandler(),
-    ".hpp": CppHandler(),
-    ".hxx": CppHandler(),
+    ".c": _CPP,
+    ".cpp": _CPP,
+    ".cc": _CPP,
+    ".cxx": _CPP,
+    ".h": _CPP,
+    ".hpp": _CPP,
+    ".hxx": _CPP,
     
     # JavaScript/TypeScript
-    ".js": JavaScriptHandler(),
-    ".jsx": JavaScriptHandler(),
-    ".ts": JavaScriptHandler(),
-    ".tsx": JavaScriptHandler(),
-    ".mjs": JavaScriptHandler(),
-    ".cjs": JavaScriptHandler(),
+    ".js": _JAVASCRIPT,
+    ".jsx": _JAVASCRIPT,
+    ".ts": _JAVASCRIPT,
+    ".tsx": _JAVASCRIPT,
+    ".mjs": _JAVASCRIPT,
+    ".cjs": _JAVASCRIPT,
+}
+
+# One shared instance per handler class, created lazily
+_HANDLER_CACHE: Dict[Tuple[str, str], BaseLanguageHandler] = {}
+
+# Display names, keyed by the same extensions as LANGUAGE_HANDLERS
+LANGUAGE_NAMES: Dict[str, str] = {
+    ".py": "Python",
+    ".java": "Java",
+    ".c": "C",
+    ".h": "C",
+    ".cpp": "C++",
+    ".cc": "C++",
+    ".cxx": "C++",
+    ".hpp": "C++",
+    ".hxx": "C++",
+    ".js": "JavaScript",
+    ".mjs": "JavaScript",
+    ".cjs": "JavaScript",
+    ".jsx": "JavaScript (React)",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript (React)",
 }
 
 
+def _get_extension(filename: str) -> str:
+    """Return the lowercased extension of a filename (e.g. ".py")."""
+    return os.path.splitext(filename)[1].lower()
+
+
 def get_handler_for_file(filename: str) -> Optional[BaseLanguageHandler]:
     """
     Get the appropriate language handler for a given filename.
@@ -47,10 +79,16 @@ def get_handler_for_file(filename: str) -> Optional[BaseLanguageHandler]:
     Returns:
         Language handler instance or None if no handler found
     """
-    for ext, handler in LANGUAGE_HANDLERS.items():
-        if filename.endswith(ext):
-            return handler
-    return None
+    spec = LANGUAGE_HANDLERS.get(_get_extension(filename))
+    if spec is None:
+        return None
+    
+    handler = _HANDLER_CACHE.get(spec)
+    if handler is None:
+        module_name, class_name = spec
+        handler_class = getattr(importlib.import_module(module_name), class_name)
+        handler = _HANDLER_CACHE[spec] = handler_class()
+    return handler
 
 
 def get_supported_extensions() -> list:
@@ -73,7 +111,7 @@ def is_supported_file(filename: str) -> bool:
     Returns:
         True if supported, False otherwise
     """
-    return get_handler_for_file(filename) is not None
+    return _get_extension(filename) in LANGUAGE_HANDLERS
 
 
 def get_language_name(filename: str) -> str:
@@ -86,21 +124,4 @@ def get_language_name(filename: str) -> str:
     Returns:
         Language name (e.g., "Python", "JavaScript") or "Unknown"
     """
-    if filename.endswith('.py'):
-        return "Python"
-    elif filename.endswith('.java'):
-        return "Java"
-    elif filename.endswith(('.c', '.h')):
-        return "C"
-    elif filename.endswith(('.cpp', '.cc', '.cxx', '.hpp', '.hxx')):
-        return "C++"
-    elif filename.endswith(('.js', '.mjs', '.cjs')):
-        return "JavaScript"
-    elif filename.endswith('.jsx'):
-        return "JavaScript (React)"
-    elif filename.endswith('.ts'):
-        return "TypeScript"
-    elif filename.endswith('.tsx'):
-        return "TypeScript (React)"
-    else:
-        return "Unknown"
\ No newline at end of file
+    return LANGUAGE_NAMES.get(_get_extension(filename), "Unknown")
@@ -1,5 +1,32 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterable, NamedTuple, Optional, Tuple
+
+
+class Issue(NamedTuple):
+    """
+    One detected code issue.
+
+    A tuple needs far less memory than a four-key dict, and issues are
+    created by the thousand on large projects. Consumers read issues like
+    dicts, so string indexing and get() work as they would on a dict.
+    """
+    line: int
+    message: str
+    severity: str
+    type: str
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field by name, like dict.get()."""
+        return getattr(self, key) if key in self._fields else default
+
 
 class BaseLanguageHandler(ABC):
 
@@ -8,7 +35,7 @@ class BaseLanguageHandler(ABC):
         pass
 
     @abstractmethod
-    def analyze(self, tree: Any) -> Dict:
+    def analyze(self, tree: Any, source_code: str) -> Dict:
         pass
 
     @abstractmethod
@@ -18,3 +45,36 @@ class BaseLanguageHandler(ABC):
     @abstractmethod
     def ai_prompt_context(self) -> str:
         pass
+
+    @classmethod
+    def analyze_many(
+        cls,
+        files: Iterable[Tuple[str, str]],
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """
+        Parse and analyze many files of this handler's language.
+
+        Files share no state, so they are spread over a process pool
+        (CPU-bound scanning, so threads would serialize on the GIL).
+
+        Args:
+            files: (path, source_code) pairs
+            max_workers: Worker processes, defaults to the CPU count
+
+        Returns:
+            Dictionary mapping each path to its analysis results
+        """
+        files = list(files)
+        if len(files) < 2:
+            return dict(cls._analyze_one(file) for file in files)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return dict(pool.map(cls._analyze_one, files, chunksize=16))
+
+    @classmethod
+    def _analyze_one(cls, file: Tuple[str, str]) -> Tuple[str, Dict]:
+        """Parse and analyze one (path, source_code) pair in a worker."""
+        path, source_code = file
+        handler = cls()
+        return path, handler.analyze(handler.parse(source_code), source_code)
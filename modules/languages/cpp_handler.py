@@ -1,11 +1,190 @@
 """
 C/C++ language handler for IRMS
 """
-from modules.languages.base import BaseLanguageHandler
+from modules.languages.base import BaseLanguageHandler, Issue
+from modules.languages.parse_cache import PARSE_CACHE
+from modules.languages.line_index import LineIndex, in_line_order
 from modules.change_detector import ChangeDetector
-from typing import Any, Dict
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
 import re
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# All C/C++ scan patterns are compiled with re.ASCII: identifiers, digits and
+# whitespace in C/C++ are ASCII, and ASCII-only \w, \s, \d and \b skip the
+# Unicode category lookups that dominate scans over str sources
+
+# Single-pass structure tokenizer. Comments, string/char literals and
+# preprocessor lines are consumed whole, so declarations inside them are
+# never reported; the named groups capture the structure we extract. The
+# leading class lists every character a token can start with, which lets
+# the regex engine skip ahead instead of trying each branch at each offset.
+# A function name follows its return type, or starts its line after any
+# indentation (constructors and destructors have no return type).
+_RE_STRUCTURE = re.compile(
+    r'(?:(?=[/"\'#cn\s])|^)(?:'
+    r'//[^\n]*'
+    r'|/\*.*?(?:\*/|\Z)'
+    r'|"(?:\\.|[^"\\\n])*"?'
+    r"|'(?:\\.|[^'\\\n])*'?"
+    r'|^[^\S\n]*#[^\S\n]*(?:include[^\S\n]*[<"](?P<include>[^>"\n]+)[>"]|(?:\\\n|[^\n])*)'
+    r'|\bclass\s+(?P<class>\w+)'
+    r'|\bnamespace\s+(?P<namespace>\w+)'
+    r'|(?:(?<=[\w*&])\s+|^[^\S\n]*)(?P<function>~?\w+)\s*\([^(){};]*\)\s*(?:const)?\s*\{)',
+    re.MULTILINE | re.DOTALL | re.ASCII
+)
+
+# Control keywords that look like function definitions: `if (x) {`
+_NOT_FUNCTIONS = frozenset(['if', 'for', 'while', 'switch', 'catch'])
+
+
+def _tokenize(source_code: str) -> Dict[str, list]:
+    """
+    Extract functions, classes, includes and namespaces in one scan.
+    
+    Args:
+        source_code: C/C++ source code string
+        
+    Returns:
+        Dictionary of name lists, each in source order
+    """
+    structure = {'functions': [], 'classes': [], 'includes': [], 'namespaces': []}
+    functions = structure['functions']
+    
+    for match in _RE_STRUCTURE.finditer(source_code):
+        kind = match.lastgroup
+        if kind == 'function':
+            name = match.group('function')
+            if name not in _NOT_FUNCTIONS:
+                functions.append(name)
+        elif kind == 'class':
+            structure['classes'].append(match.group('class'))
+        elif kind == 'include':
+            structure['includes'].append(match.group('include'))
+        elif kind == 'namespace':
+            structure['namespaces'].append(match.group('namespace'))
+    
+    return structure
+
+# Issue tokens as (kind, pattern); [^\S\n] is whitespace that stays within
+# the line, so no token spans a newline
+_MEMORY_TOKENS = (
+    ('malloc', r'(?:malloc|calloc)\('),
+    ('free', r'free\('),
+    ('new', r'\bnew[^\S\n]'),
+    ('delete', r'delete '),
+    ('unsafe_string', r'(?:strcpy|strcat)\('),
+    ('gets', r'gets\('),
+    ('pointer_deref', r'\*[^\S\n]*\w+[^\S\n]*[=;]'),
+)
+_COMMON_TOKENS = (
+    ('magic_number', r'\b\d{3,}\b'),
+    ('single_char_var', r'\b[a-hln-z][^\S\n]*='),
+    ('using_namespace_std', r'using namespace std'),
+    ('c_cast', r'\([A-Za-z_]\w*[^\S\n]*\*?[^\S\n]*\)'),
+)
+
+
+def _compile_tokens(tokens: tuple, first_chars: str) -> Pattern:
+    """
+    Build one alternation with a named group per token kind.
+    
+    The alternation sits inside a zero-width lookahead so every occurrence
+    of every kind is reported in a single pass, even where tokens of
+    different kinds overlap. first_chars is a character class of every
+    character a token can start with; checking it first lets the regex
+    engine skip offsets where no branch can match.
+    """
+    alternatives = '|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in tokens)
+    return re.compile(f'(?={first_chars})(?={alternatives})', re.ASCII)
+
+
+def _compile_hyperscan(tokens: tuple) -> Optional[Any]:
+    """Build a Hyperscan block-mode database for the tokens, if available."""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[pattern.encode('ascii') for _, pattern in tokens],
+        ids=list(range(len(tokens))),
+        elements=len(tokens),
+        flags=[0] * len(tokens)
+    )
+    return database
+
+
+_RE_MEMORY_TOKENS = _compile_tokens(_MEMORY_TOKENS, r'[mcfndsg*]')
+_RE_COMMON_TOKENS = _compile_tokens(_COMMON_TOKENS, r'[\da-hln-zu(]')
+_HS_MEMORY_TOKENS = _compile_hyperscan(_MEMORY_TOKENS)
+_HS_COMMON_TOKENS = _compile_hyperscan(_COMMON_TOKENS)
+
+
+def _scan_tokens(
+    source_code: str,
+    tokens: tuple,
+    token_re: Pattern,
+    hs_database: Optional[Any]
+) -> List[Tuple[str, int]]:
+    """
+    Find every token hit as (kind, offset).
+    
+    Uses the Hyperscan database for ASCII sources (where byte and character
+    offsets agree) and the compiled alternation otherwise. Hits come back
+    in source order; the offset is on the token's line.
+    """
+    if hs_database is not None and source_code.isascii():
+        hits: List[Tuple[str, int]] = []
+        
+        def on_match(token_id, start, end, flags, context):
+            hits.append((tokens[token_id][0], end - 1))
+        
+        hs_database.scan(source_code.encode('ascii'), match_event_handler=on_match)
+        hits.sort(key=itemgetter(1))
+        return hits
+    
+    return [(match.lastgroup, match.start()) for match in token_re.finditer(source_code)]
+
+
+# Substrings that mark a source as C++ rather than plain C. Checked with
+# short-circuiting `in` tests: each is a C-level search, and on plain C
+# sources (no hit) ten of them beat one regex alternation of the same
+# literals
+_CPP_INDICATORS = (
+    'class ', 'namespace ', 'template', 'std::',
+    'cout', 'cin', 'new ', 'delete ', 'try ', 'catch'
+)
+
+# Control flow keywords counted by _count_control_flow; each is counted
+# independently with str.count, which scans in C
+_CONTROL_FLOW_KEYWORDS = (
+    'if(', 'if (', 'else', 'for(', 'for (', 'while(', 'while (',
+    'case ', '&&', '||',
+    '?'  # Ternary operator
+)
+
+# Issue kind -> (check order within a line, message, severity, type)
+_MEMORY_ISSUES = {
+    'malloc': (0, 'Manual memory allocation - ensure corresponding free() exists', 'medium', 'memory'),
+    'new': (1, 'Raw pointer allocation - consider using smart pointers (unique_ptr/shared_ptr)', 'medium', 'memory'),
+    'unsafe_string': (2, 'Unsafe string function - use strncpy or strcat_s instead', 'high', 'security'),
+    'gets': (3, 'gets() is dangerous and deprecated - use fgets() instead', 'critical', 'security'),
+    'pointer_deref': (4, 'Potential NULL pointer dereference - add NULL check', 'high', 'safety'),
+}
+_COMMON_ISSUES = {
+    'magic_number': (0, 'Magic number detected - consider using named constant', 'low', 'maintainability'),
+    'single_char_var': (1, 'Single character variable name - use descriptive names', 'low', 'readability'),
+    'using_namespace_std': (2, 'Avoid "using namespace std" in headers - causes namespace pollution', 'medium', 'best_practice'),
+    'c_cast': (3, 'C-style cast detected - use static_cast/dynamic_cast/const_cast', 'low', 'modern_cpp'),
+}
+
 
 class CppHandler(BaseLanguageHandler):
     """Handler for C and C++ language files."""
@@ -14,19 +193,26 @@ class CppHandler(BaseLanguageHandler):
         """
         Parse C/C++ source code (text-based, no AST).
         
+        Results are cached by source content, see parse_cache.
+        
         Args:
             source_code: C/C++ source code string
             
         Returns:
             Dictionary with parsed information
         """
+        return PARSE_CACHE.get_or_parse('cpp', source_code, self._parse)
+
+    def _parse(self, source_code: str) -> Dict[str, Any]:
+        """Parse C/C++ source code without the cache."""
+        scan = self._scan(source_code)
         parsed = {
             'source': source_code,
-            'functions': self._extract_functions(source_code),
-            'classes': self._extract_classes(source_code),
-            'includes': self._extract_includes(source_code),
-            'namespaces': self._extract_namespaces(source_code),
-            'is_cpp': self._is_cpp_code(source_code)
+            'functions': scan['functions'],
+            'classes': scan['classes'],
+            'includes': scan['includes'],
+            'namespaces': scan['namespaces'],
+            'is_cpp': scan['is_cpp']
         }
         return parsed
 
@@ -41,15 +227,11 @@ class CppHandler(BaseLanguageHandler):
         Returns:
             Analysis results dictionary
         """
-        lines = source_code.split('\n')
-        
-        # Count various constructs
-        issues = []
-        complexity = self._estimate_complexity(source_code)
-        
-        # Check for common issues
-        issues.extend(self._check_memory_issues(source_code))
-        issues.extend(self._check_common_issues(source_code))
+        # Structure, complexity and issues come from the same cached scan
+        # that parse() used
+        scan = self._scan(source_code)
+        complexity = self._estimate_complexity(scan['complexity_raw'], len(scan['functions']))
+        issues = list(scan['issues'])
         
         analysis = {
             'complexity': {
@@ -59,7 +241,7 @@ class CppHandler(BaseLanguageHandler):
             },
             'metrics': {
                 'maintainability_index': max(0, 100 - complexity * 2),
-                'loc': len(lines),
+                'loc': scan['loc'],
                 'functions': len(tree.get('functions', [])),
                 'classes': len(tree.get('classes', []))
             },
@@ -101,192 +283,150 @@ Follow modern C++ best practices (prefer smart pointers, avoid raw pointers when
     
     def _is_cpp_code(self, source_code: str) -> bool:
         """Detect if code is C++ (vs plain C)."""
-        cpp_indicators = [
-            'class ', 'namespace ', 'template', 'std::', 
-            'cout', 'cin', 'new ', 'delete ', 'try ', 'catch'
-        ]
-        return any(indicator in source_code for indicator in cpp_indicators)
+        return any(indicator in source_code for indicator in _CPP_INDICATORS)
     
-    def _extract_functions(self, source_code: str) -> list:
-        """Extract function definitions from C/C++ code."""
-        # Pattern for function definitions
-        pattern = r'(?:[\w\s\*&]+)\s+(\w+)\s*\([^)]*\)\s*(?:const)?\s*{'
-        matches = re.finditer(pattern, source_code)
-        functions = []
-        for match in matches:
-            func_name = match.group(1)
-            # Filter out common keywords
-            if func_name not in ['if', 'for', 'while', 'switch', 'catch']:
-                functions.append(func_name)
-        return functions
+    def _scan(self, source_code: str) -> Dict[str, Any]:
+        """Get the cached scan shared by parse() and analyze()."""
+        return PARSE_CACHE.get_or_parse('cpp-scan', source_code, self._scan_source)
     
-    def _extract_classes(self, source_code: str) -> list:
-        """Extract class names from C++ code."""
-        pattern = r'class\s+(\w+)'
-        matches = re.finditer(pattern, source_code)
-        return [match.group(1) for match in matches]
-    
-    def _extract_includes(self, source_code: str) -> list:
-        """Extract include statements."""
-        pattern = r'#include\s*[<"]([^>"]+)[>"]'
-        matches = re.finditer(pattern, source_code)
-        return [match.group(1) for match in matches]
-    
-    def _extract_namespaces(self, source_code: str) -> list:
-        """Extract namespace declarations."""
-        pattern = r'namespace\s+(\w+)'
-        matches = re.finditer(pattern, source_code)
-        return [match.group(1) for match in matches]
+    def _scan_source(self, source_code: str) -> Dict[str, Any]:
+        """
+        Collect everything parse() and analyze() need from one source.
+        
+        Args:
+            source_code: C/C++ source code string
+            
+        Returns:
+            Dictionary with the structure lists, is_cpp, the raw control
+            flow count, the line count and the detected issues
+        """
+        scan: Dict[str, Any] = _tokenize(source_code)
+        scan['is_cpp'] = self._is_cpp_code(source_code)
+        scan['complexity_raw'] = self._count_control_flow(source_code)
+        
+        # One line index shared by the line count and both checks
+        line_index = LineIndex(source_code)
+        scan['loc'] = line_index.line_count
+        scan['issues'] = list(chain(
+            self._check_memory_issues(source_code, line_index),
+            self._check_common_issues(source_code, line_index, scan['is_cpp'])
+        ))
+        return scan
     
-    def _estimate_complexity(self, source_code: str) -> float:
-        """Estimate cyclomatic complexity (simplified)."""
+    def _count_control_flow(self, source_code: str) -> int:
+        """Count control flow constructs, plus one for the base path."""
         complexity = 1  # Base complexity
         
         # Count control flow statements
-        complexity += source_code.count('if(')
-        complexity += source_code.count('if (')
-        complexity += source_code.count('else')
-        complexity += source_code.count('for(')
-        complexity += source_code.count('for (')
-        complexity += source_code.count('while(')
-        complexity += source_code.count('while (')
-        complexity += source_code.count('case ')
-        complexity += source_code.count('&&')
-        complexity += source_code.count('||')
-        complexity += source_code.count('?')  # Ternary operator
+        complexity += sum(source_code.count(keyword) for keyword in _CONTROL_FLOW_KEYWORDS)
+        
+        return complexity
+    
+    def _estimate_complexity(self, complexity_raw: int, function_count: int) -> float:
+        """Estimate cyclomatic complexity (simplified)."""
+        complexity = complexity_raw
         
         # Normalize by number of functions
-        functions = self._extract_functions(source_code)
-        if functions:
-            complexity = complexity / len(functions)
+        if function_count:
+            complexity = complexity / function_count
         
         return round(complexity, 2)
     
-    def _check_memory_issues(self, source_code: str) -> list:
+    def _check_memory_issues(self, source_code: str, line_index: LineIndex) -> Iterator[Issue]:
         """Check for potential memory issues."""
-        issues = []
-        lines = source_code.split('\n')
+        counts: Counter = Counter()  # kind -> lines with that token
+        yield from in_line_order(self._memory_entries(source_code, line_index, counts))
         
-        malloc_count = 0
-        free_count = 0
-        new_count = 0
-        delete_count = 0
+        # Check for memory leak patterns (counts are final once the scan is done)
+        if counts['malloc'] > counts['free']:
+            yield Issue(
+                line=0,
+                message=f"Potential memory leak - {counts['malloc']} malloc/calloc but only {counts['free']} free",
+                severity='high',
+                type='memory'
+            )
         
-        for i, line in enumerate(lines, 1):
-            # Check malloc/free balance
-            if 'malloc(' in line or 'calloc(' in line:
-                malloc_count += 1
-                issues.append({
-                    'line': i,
-                    'message': 'Manual memory allocation - ensure corresponding free() exists',
-                    'severity': 'medium',
-                    'type': 'memory'
-                })
-            
-            if 'free(' in line:
-                free_count += 1
-            
-            # Check new/delete balance
-            if re.search(r'\bnew\s+', line):
-                new_count += 1
-                issues.append({
-                    'line': i,
-                    'message': 'Raw pointer allocation - consider using smart pointers (unique_ptr/shared_ptr)',
-                    'severity': 'medium',
-                    'type': 'memory'
-                })
-            
-            if 'delete ' in line:
-                delete_count += 1
+        if counts['new'] > counts['delete']:
+            yield Issue(
+                line=0,
+                message=f"Potential memory leak - {counts['new']} new but only {counts['delete']} delete",
+                severity='high',
+                type='memory'
+            )
+    
+    def _memory_entries(
+        self,
+        source_code: str,
+        line_index: LineIndex,
+        counts: Counter
+    ) -> Iterator[Tuple[int, int, Issue]]:
+        """Yield (line, order, issue) memory entries, counting each kind's lines into counts."""
+        reported = {}  # kind -> last line seen, one issue per kind per line
+        
+        hits = _scan_tokens(source_code, _MEMORY_TOKENS, _RE_MEMORY_TOKENS, _HS_MEMORY_TOKENS)
+        for kind, offset in hits:
+            line_no = line_index.line_of(offset)
+            if reported.get(kind) == line_no:
+                continue
+            reported[kind] = line_no
             
-            # Check for potential buffer overflow
-            if 'strcpy(' in line or 'strcat(' in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Unsafe string function - use strncpy or strcat_s instead',
-                    'severity': 'high',
-                    'type': 'security'
-                })
+            counts[kind] += 1
             
-            # Check for gets() (extremely dangerous)
-            if 'gets(' in line:
-                issues.append({
-                    'line': i,
-                    'message': 'gets() is dangerous and deprecated - use fgets() instead',
-                    'severity': 'critical',
-                    'type': 'security'
-                })
+            # free/delete only feed the malloc/free and new/delete balance
+            if kind not in _MEMORY_ISSUES:
+                continue
+            # Only flag when neither this nor the previous line has a check
+            if kind == 'pointer_deref' and (
+                    line_no == 1 or line_index.line_contains(line_no, 'if')
+                    or line_index.line_contains(line_no - 1, 'if')):
+                continue
             
-            # Check for NULL pointer usage without check
-            if re.search(r'\*\s*\w+\s*[=;]', line) and 'if' not in line:
-                if i > 1 and 'if' not in lines[i-2]:
-                    issues.append({
-                        'line': i,
-                        'message': 'Potential NULL pointer dereference - add NULL check',
-                        'severity': 'high',
-                        'type': 'safety'
-                    })
-        
-        # Check for memory leak patterns
-        if malloc_count > free_count:
-            issues.append({
-                'line': 0,
-                'message': f'Potential memory leak - {malloc_count} malloc/calloc but only {free_count} free',
-                'severity': 'high',
-                'type': 'memory'
-            })
-        
-        if new_count > delete_count:
-            issues.append({
-                'line': 0,
-                'message': f'Potential memory leak - {new_count} new but only {delete_count} delete',
-                'severity': 'high',
-                'type': 'memory'
-            })
-        
-        return issues
+            order, message, severity, issue_type = _MEMORY_ISSUES[kind]
+            yield line_no, order, Issue(
+                line=line_no,
+                message=message,
+                severity=severity,
+                type=issue_type
+            )
     
-    def _check_common_issues(self, source_code: str) -> list:
+    def _check_common_issues(
+        self,
+        source_code: str,
+        line_index: LineIndex,
+        is_cpp: bool
+    ) -> Iterator[Issue]:
         """Check for common C/C++ issues."""
-        issues = []
-        lines = source_code.split('\n')
+        return in_line_order(self._common_entries(source_code, line_index, is_cpp))
+    
+    def _common_entries(
+        self,
+        source_code: str,
+        line_index: LineIndex,
+        is_cpp: bool
+    ) -> Iterator[Tuple[int, int, Issue]]:
+        """Yield (line, order, issue) entries for the common checks."""
+        reported = {}  # kind -> last line seen, one issue per kind per line
         
-        for i, line in enumerate(lines, 1):
-            # Check for magic numbers
-            if re.search(r'\b\d{3,}\b', line) and 'define' not in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Magic number detected - consider using named constant',
-                    'severity': 'low',
-                    'type': 'maintainability'
-                })
-            
-            # Check for single character variable names (except i, j, k in loops)
-            if re.search(r'\b[a-hln-z]\s*=', line) and 'for' not in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Single character variable name - use descriptive names',
-                    'severity': 'low',
-                    'type': 'readability'
-                })
+        hits = _scan_tokens(source_code, _COMMON_TOKENS, _RE_COMMON_TOKENS, _HS_COMMON_TOKENS)
+        for kind, offset in hits:
+            line_no = line_index.line_of(offset)
+            if reported.get(kind) == line_no:
+                continue
+            reported[kind] = line_no
             
-            # Check for using namespace std in headers
-            if 'using namespace std' in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Avoid "using namespace std" in headers - causes namespace pollution',
-                    'severity': 'medium',
-                    'type': 'best_practice'
-                })
+            if kind == 'magic_number' and line_index.line_contains(line_no, 'define'):
+                continue
+            # Single character names are fine in loops (i, j, k)
+            if kind == 'single_char_var' and line_index.line_contains(line_no, 'for'):
+                continue
+            # C-style casts only matter in C++ code
+            if kind == 'c_cast' and not is_cpp:
+                continue
             
-            # Check for C-style casts in C++ code
-            if self._is_cpp_code(source_code):
-                if re.search(r'\([A-Za-z_]\w*\s*\*?\s*\)', line):
-                    issues.append({
-                        'line': i,
-                        'message': 'C-style cast detected - use static_cast/dynamic_cast/const_cast',
-                        'severity': 'low',
-                        'type': 'modern_cpp'
-                    })
-        
-        return issues
\ No newline at end of file
+            order, message, severity, issue_type = _COMMON_ISSUES[kind]
+            yield line_no, order, Issue(
+                line=line_no,
+                message=message,
+                severity=severity,
+                type=issue_type
+            )
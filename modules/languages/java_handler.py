@@ -1,12 +1,44 @@
 """
 Java language handler for IRMS
 """
-from modules.languages.base import BaseLanguageHandler
+from modules.languages.base import BaseLanguageHandler, Issue
+from modules.languages.parse_cache import PARSE_CACHE
+from modules.languages.line_index import LineIndex
 from modules.change_detector import ChangeDetector
-from typing import Any, Dict
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, Iterator
+import heapq
 import re
 
 
+# Precompiled patterns
+_RE_CLASS = re.compile(r'(?:public|private|protected)?\s*(?:abstract|final)?\s*class\s+(\w+)')
+_RE_METHOD = re.compile(r'(?:public|private|protected)?\s*(?:static)?\s*(?:\w+)\s+(\w+)\s*\([^)]*\)')
+_RE_IMPORT = re.compile(r'import\s+([\w.]+);')
+_RE_PACKAGE = re.compile(r'package\s+([\w.]+);')
+
+# Line checks: each pattern is anchored at a line start and matches at most
+# once per line, so one finditer over the source replaces a per-line loop
+# ([^\S\n] is whitespace that stays within the line)
+_LINE_LOWERCASE_CLASS = re.compile(r'^[^\n]*?class[^\S\n]+([a-z]\w*)', re.MULTILINE)
+_LINE_UPPERCASE_METHOD = re.compile(
+    r'^[^\n]*?(?:public|private|protected)[^\S\n]+\w+[^\S\n]+([A-Z]\w*)[^\S\n]*\(',
+    re.MULTILINE
+)
+_LINE_SYSTEM_OUT = re.compile(r'^[^\n]*?System\.out\.println', re.MULTILINE)
+# A 'catch' line followed by a blank or '}'-only line that is not the last line
+_LINE_EMPTY_CATCH = re.compile(
+    r'^[^\n]*?catch[^\n]*\n[^\S\n]*\}?[^\S\n]*(?=\n)', re.MULTILINE
+)
+
+# Decision point keywords counted by _estimate_complexity; each is counted
+# independently with str.count, which scans in C
+_CONTROL_FLOW_KEYWORDS = (
+    'if ', 'else ', 'for ', 'while ', 'case ', 'catch ', '&&', '||'
+)
+
+
 class JavaHandler(BaseLanguageHandler):
     """Handler for Java language files."""
 
@@ -14,12 +46,18 @@ class JavaHandler(BaseLanguageHandler):
         """
         Parse Java source code (text-based, no AST).
         
+        Results are cached by source content, see parse_cache.
+        
         Args:
             source_code: Java source code string
             
         Returns:
             Dictionary with parsed information
         """
+        return PARSE_CACHE.get_or_parse('java', source_code, self._parse)
+
+    def _parse(self, source_code: str) -> Dict[str, Any]:
+        """Parse Java source code without the cache."""
         parsed = {
             'source': source_code,
             'classes': self._extract_classes(source_code),
@@ -40,15 +78,17 @@ class JavaHandler(BaseLanguageHandler):
         Returns:
             Analysis results dictionary
         """
-        lines = source_code.split('\n')
+        # One line index for the line count and every line-based check
+        line_index = LineIndex(source_code)
         
         # Count various constructs
-        issues = []
-        complexity = self._estimate_complexity(source_code)
+        complexity = self._estimate_complexity(source_code, len(tree.get('methods', [])))
         
         # Check for common issues
-        issues.extend(self._check_naming_conventions(source_code))
-        issues.extend(self._check_common_issues(source_code))
+        issues = list(chain(
+            self._check_naming_conventions(source_code, line_index),
+            self._check_common_issues(source_code, line_index)
+        ))
         
         analysis = {
             'complexity': {
@@ -58,7 +98,7 @@ class JavaHandler(BaseLanguageHandler):
             },
             'metrics': {
                 'maintainability_index': max(0, 100 - complexity * 2),
-                'loc': len(lines),
+                'loc': line_index.line_count,
                 'methods': len(tree.get('methods', [])),
                 'classes': len(tree.get('classes', []))
             },
@@ -99,14 +139,12 @@ Follow Java best practices and design patterns."""
     
     def _extract_classes(self, source_code: str) -> list:
         """Extract class names from Java code."""
-        pattern = r'(?:public|private|protected)?\s*(?:abstract|final)?\s*class\s+(\w+)'
-        matches = re.finditer(pattern, source_code)
+        matches = _RE_CLASS.finditer(source_code)
         return [match.group(1) for match in matches]
     
     def _extract_methods(self, source_code: str) -> list:
         """Extract method signatures from Java code."""
-        pattern = r'(?:public|private|protected)?\s*(?:static)?\s*(?:\w+)\s+(\w+)\s*\([^)]*\)'
-        matches = re.finditer(pattern, source_code)
+        matches = _RE_METHOD.finditer(source_code)
         methods = []
         for match in matches:
             method_name = match.group(1)
@@ -117,93 +155,77 @@ Follow Java best practices and design patterns."""
     
     def _extract_imports(self, source_code: str) -> list:
         """Extract import statements."""
-        pattern = r'import\s+([\w.]+);'
-        matches = re.finditer(pattern, source_code)
+        matches = _RE_IMPORT.finditer(source_code)
         return [match.group(1) for match in matches]
     
     def _extract_package(self, source_code: str) -> str:
         """Extract package name."""
-        pattern = r'package\s+([\w.]+);'
-        match = re.search(pattern, source_code)
+        match = _RE_PACKAGE.search(source_code)
         return match.group(1) if match else ''
     
-    def _estimate_complexity(self, source_code: str) -> float:
-        """Estimate cyclomatic complexity (simplified)."""
+    def _estimate_complexity(self, source_code: str, method_count: int) -> float:
+        """Estimate cyclomatic complexity (simplified), per parsed method."""
         # Count decision points
         complexity = 1  # Base complexity
         
         # Count control flow statements
-        complexity += source_code.count('if ')
-        complexity += source_code.count('else ')
-        complexity += source_code.count('for ')
-        complexity += source_code.count('while ')
-        complexity += source_code.count('case ')
-        complexity += source_code.count('catch ')
-        complexity += source_code.count('&&')
-        complexity += source_code.count('||')
+        complexity += sum(source_code.count(keyword) for keyword in _CONTROL_FLOW_KEYWORDS)
         
         # Normalize by number of methods
-        methods = self._extract_methods(source_code)
-        if methods:
-            complexity = complexity / len(methods)
+        if method_count:
+            complexity = complexity / method_count
         
         return round(complexity, 2)
     
-    def _check_naming_conventions(self, source_code: str) -> list:
+    def _check_naming_conventions(self, source_code: str, line_index: LineIndex) -> Iterator[Issue]:
         """Check Java naming conventions."""
-        issues = []
-        lines = source_code.split('\n')
-        
         # Check class names (should start with uppercase)
-        class_pattern = r'class\s+([a-z]\w*)'
-        for i, line in enumerate(lines, 1):
-            match = re.search(class_pattern, line)
-            if match:
-                issues.append({
-                    'line': i,
-                    'message': f"Class name '{match.group(1)}' should start with uppercase letter",
-                    'severity': 'medium',
-                    'type': 'naming'
-                })
+        class_names = (
+            Issue(
+                line=line_index.line_of(match.start()),
+                message=f"Class name '{match.group(1)}' should start with uppercase letter",
+                severity='medium',
+                type='naming'
+            )
+            for match in _LINE_LOWERCASE_CLASS.finditer(source_code)
+        )
         
         # Check method names (should start with lowercase)
-        method_pattern = r'(?:public|private|protected)\s+\w+\s+([A-Z]\w*)\s*\('
-        for i, line in enumerate(lines, 1):
-            match = re.search(method_pattern, line)
-            if match:
-                issues.append({
-                    'line': i,
-                    'message': f"Method name '{match.group(1)}' should start with lowercase letter",
-                    'severity': 'low',
-                    'type': 'naming'
-                })
-        
-        return issues
+        method_names = (
+            Issue(
+                line=line_index.line_of(match.start()),
+                message=f"Method name '{match.group(1)}' should start with lowercase letter",
+                severity='low',
+                type='naming'
+            )
+            for match in _LINE_UPPERCASE_METHOD.finditer(source_code)
+        )
+        
+        return chain(class_names, method_names)
     
-    def _check_common_issues(self, source_code: str) -> list:
+    def _check_common_issues(self, source_code: str, line_index: LineIndex) -> Iterator[Issue]:
         """Check for common Java issues."""
-        issues = []
-        lines = source_code.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for System.out.println (should use logger)
-            if 'System.out.println' in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Consider using a logger instead of System.out.println',
-                    'severity': 'low',
-                    'type': 'best_practice'
-                })
-            
-            # Check for empty catch blocks
-            if 'catch' in line and i + 1 < len(lines):
-                next_line = lines[i].strip()
-                if next_line == '}' or next_line == '':
-                    issues.append({
-                        'line': i,
-                        'message': 'Empty catch block - consider logging the exception',
-                        'severity': 'high',
-                        'type': 'error_handling'
-                    })
-        
-        return issues
\ No newline at end of file
+        # Check for System.out.println (should use logger)
+        system_outs = (
+            Issue(
+                line=line_index.line_of(match.start()),
+                message='Consider using a logger instead of System.out.println',
+                severity='low',
+                type='best_practice'
+            )
+            for match in _LINE_SYSTEM_OUT.finditer(source_code)
+        )
+        
+        # Check for empty catch blocks
+        empty_catches = (
+            Issue(
+                line=line_index.line_of(match.start()),
+                message='Empty catch block - consider logging the exception',
+                severity='high',
+                type='error_handling'
+            )
+            for match in _LINE_EMPTY_CATCH.finditer(source_code)
+        )
+        
+        # Report in line order, checks in the order above within a line
+        return heapq.merge(system_outs, empty_catches, key=attrgetter('line'))
@@ -1,12 +1,84 @@
 """
 JavaScript language handler for IRMS
 """
-from modules.languages.base import BaseLanguageHandler
+from modules.languages.base import BaseLanguageHandler, Issue
+from modules.languages.parse_cache import PARSE_CACHE
+from modules.languages.line_index import LineIndex, in_line_order
 from modules.change_detector import ChangeDetector
-from typing import Any, Dict
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterator, Tuple
+import heapq
 import re
 
 
+# Precompiled patterns
+_RE_FUNCTION_DECL = re.compile(r'function\s+(\w+)\s*\(')
+_RE_ARROW_FUNCTION = re.compile(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:\([^)]*\)|[^=])\s*=>')
+_RE_METHOD = re.compile(r'(\w+)\s*\([^)]*\)\s*\{')
+_RE_CLASS = re.compile(r'class\s+(\w+)')
+_RE_ES_IMPORT = re.compile(r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]')
+_RE_REQUIRE = re.compile(r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)')
+_RE_EXPORT_LIST = re.compile(r'export\s+\{([^}]+)\}')
+_RE_EXPORT_DECL = re.compile(r'export\s+(?:const|let|var|function|class)\s+(\w+)')
+
+# Keywords that _RE_METHOD matches like method definitions: `if (x) {`
+_NOT_FUNCTIONS = frozenset(['if', 'for', 'while', 'switch', 'catch', 'function'])
+
+# Line checks: each pattern is anchored at a line start and matches at most
+# once per line, so one finditer over the source replaces a per-line loop
+# ([^\S\n] is whitespace that stays within the line)
+_LINE_MAGIC_NUMBER = re.compile(r'^(?!.*const)(?!.*let)[^\n]*?\b\d{3,}\b', re.MULTILINE)
+_LINE_SINGLE_LETTER_VAR = re.compile(
+    r'^(?!.*for)[^\n]*?\b(?:const|let|var)[^\S\n]+([a-hln-z])[^\S\n]*=',
+    re.MULTILINE
+)
+
+# Common-issue tokens, one named group per kind, inside a zero-width
+# lookahead so every occurrence of every kind is reported in a single pass;
+# the leading class of possible first characters lets the engine skip ahead
+_RE_COMMON_TOKENS = re.compile(
+    r'(?=[v=ce])'
+    r'(?=(?P<var>\bvar[^\S\n]+\w+)'
+    r'|(?P<loose_equality>==)'
+    r'|(?P<console_log>console\.log)'
+    r'|(?P<eval>eval\())'
+)
+
+# Issue kind -> (check order within a line, message, severity, type)
+_COMMON_ISSUES = {
+    'var': (0, 'Use const or let instead of var', 'medium', 'modern_js'),
+    'loose_equality': (1, 'Use === instead of == for comparison', 'medium', 'best_practice'),
+    'console_log': (2, 'Remove console.log statements before production', 'low', 'cleanup'),
+    'eval': (3, 'Avoid using eval() - potential security risk', 'critical', 'security'),
+}
+
+# Empty catch block, with or without a binding: catch (e) {} / catch {}
+_RE_EMPTY_CATCH = re.compile(r'catch\s*(?:\([^)]*\)\s*)?\{\s*\}')
+_EMPTY_CATCH_ISSUE = (4, 'Empty catch block - handle errors properly', 'high', 'error_handling')
+
+# Substrings that mark a source as TypeScript / React. Checked with
+# short-circuiting `in` tests: each is a C-level search, and on sources
+# with no hit they beat one regex alternation of the same literals
+_TS_INDICATORS = (
+    'interface ', 'type ', ': string', ': number', ': boolean',
+    '<T>', 'enum ', 'implements ', 'private ', 'public ', 'protected '
+)
+_REACT_INDICATORS = (
+    'import React', 'from \'react\'', 'from "react"',
+    'useState', 'useEffect', 'jsx', 'tsx', '<div', 'className='
+)
+
+# Control flow keywords counted by _estimate_complexity; each is counted
+# independently with str.count, which scans in C (so 'else if (' counts
+# for 'else if', 'else ' and 'if (')
+_CONTROL_FLOW_KEYWORDS = (
+    'if(', 'if (', 'else if', 'else ', 'for(', 'for (', 'while(', 'while (',
+    'case ', 'catch ', '&&', '||',
+    '?'  # Ternary operator
+)
+
+
 class JavaScriptHandler(BaseLanguageHandler):
     """Handler for JavaScript and TypeScript files."""
 
@@ -14,12 +86,18 @@ class JavaScriptHandler(BaseLanguageHandler):
         """
         Parse JavaScript source code (text-based, no AST).
         
+        Results are cached by source content, see parse_cache.
+        
         Args:
             source_code: JavaScript source code string
             
         Returns:
             Dictionary with parsed information
         """
+        return PARSE_CACHE.get_or_parse('javascript', source_code, self._parse)
+
+    def _parse(self, source_code: str) -> Dict[str, Any]:
+        """Parse JavaScript source code without the cache."""
         parsed = {
             'source': source_code,
             'functions': self._extract_functions(source_code),
@@ -42,15 +120,17 @@ class JavaScriptHandler(BaseLanguageHandler):
         Returns:
             Analysis results dictionary
         """
-        lines = source_code.split('\n')
+        # One line index for the line count and every line-based check
+        line_index = LineIndex(source_code)
         
         # Count various constructs
-        issues = []
-        complexity = self._estimate_complexity(source_code)
+        complexity = self._estimate_complexity(source_code, len(tree.get('functions', [])))
         
         # Check for common issues
-        issues.extend(self._check_common_issues(source_code))
-        issues.extend(self._check_best_practices(source_code))
+        issues = list(chain(
+            self._check_common_issues(source_code, line_index),
+            self._check_best_practices(source_code, line_index)
+        ))
         
         analysis = {
             'complexity': {
@@ -60,7 +140,7 @@ class JavaScriptHandler(BaseLanguageHandler):
             },
             'metrics': {
                 'maintainability_index': max(0, 100 - complexity * 2),
-                'loc': len(lines),
+                'loc': line_index.line_count,
                 'functions': len(tree.get('functions', [])),
                 'classes': len(tree.get('classes', []))
             },
@@ -105,58 +185,46 @@ Follow modern JavaScript best practices:
     
     def _is_typescript(self, source_code: str) -> bool:
         """Detect if code is TypeScript."""
-        ts_indicators = [
-            'interface ', 'type ', ': string', ': number', ': boolean',
-            '<T>', 'enum ', 'implements ', 'private ', 'public ', 'protected '
-        ]
-        return any(indicator in source_code for indicator in ts_indicators)
+        return any(indicator in source_code for indicator in _TS_INDICATORS)
     
     def _is_react(self, source_code: str) -> bool:
         """Detect if code is React."""
-        react_indicators = [
-            'import React', 'from \'react\'', 'from "react"',
-            'useState', 'useEffect', 'jsx', 'tsx', '<div', 'className='
-        ]
-        return any(indicator in source_code for indicator in react_indicators)
+        return any(indicator in source_code for indicator in _REACT_INDICATORS)
     
     def _extract_functions(self, source_code: str) -> list:
         """Extract function declarations from JavaScript code."""
         functions = []
+        seen = set()
         
-        # Regular function declarations: function name()
-        pattern1 = r'function\s+(\w+)\s*\('
-        functions.extend(re.findall(pattern1, source_code))
-        
-        # Arrow functions: const name = () =>
-        pattern2 = r'(?:const|let|var)\s+(\w+)\s*=\s*(?:\([^)]*\)|[^=])\s*=>'
-        functions.extend(re.findall(pattern2, source_code))
+        candidates = chain(
+            # Regular function declarations: function name()
+            _RE_FUNCTION_DECL.findall(source_code),
+            # Arrow functions: const name = () =>
+            _RE_ARROW_FUNCTION.findall(source_code),
+            # Method definitions: methodName(), minus keywords
+            (name for name in _RE_METHOD.findall(source_code) if name not in _NOT_FUNCTIONS)
+        )
         
-        # Method definitions: methodName()
-        pattern3 = r'(\w+)\s*\([^)]*\)\s*\{'
-        methods = re.findall(pattern3, source_code)
-        # Filter out keywords
-        keywords = ['if', 'for', 'while', 'switch', 'catch', 'function']
-        functions.extend([m for m in methods if m not in keywords and m not in functions])
+        # Remove duplicates, keeping discovery order
+        for name in candidates:
+            if name not in seen:
+                seen.add(name)
+                functions.append(name)
         
-        return list(set(functions))  # Remove duplicates
+        return functions
     
     def _extract_classes(self, source_code: str) -> list:
         """Extract class names from JavaScript code."""
-        pattern = r'class\s+(\w+)'
-        matches = re.finditer(pattern, source_code)
+        matches = _RE_CLASS.finditer(source_code)
         return [match.group(1) for match in matches]
     
     def _extract_imports(self, source_code: str) -> list:
         """Extract import statements."""
-        imports = []
-        
         # ES6 imports: import X from 'Y'
-        pattern1 = r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]'
-        imports.extend(re.findall(pattern1, source_code))
+        imports = _RE_ES_IMPORT.findall(source_code)
         
         # Require statements: require('X')
-        pattern2 = r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
-        imports.extend(re.findall(pattern2, source_code))
+        imports += _RE_REQUIRE.findall(source_code)
         
         return imports
     
@@ -169,125 +237,112 @@ Follow modern JavaScript best practices:
             exports.append('default')
         
         # export { X }
-        pattern = r'export\s+\{([^}]+)\}'
-        matches = re.findall(pattern, source_code)
-        for match in matches:
-            exports.extend([x.strip() for x in match.split(',')])
+        exports += [
+            name.strip()
+            for names in _RE_EXPORT_LIST.findall(source_code)
+            for name in names.split(',')
+        ]
         
         # export const/let/var/function/class
-        pattern2 = r'export\s+(?:const|let|var|function|class)\s+(\w+)'
-        exports.extend(re.findall(pattern2, source_code))
+        exports += _RE_EXPORT_DECL.findall(source_code)
         
         return exports
     
-    def _estimate_complexity(self, source_code: str) -> float:
-        """Estimate cyclomatic complexity (simplified)."""
+    def _estimate_complexity(self, source_code: str, function_count: int) -> float:
+        """Estimate cyclomatic complexity (simplified), per parsed function."""
         complexity = 1  # Base complexity
         
         # Count control flow statements
-        complexity += source_code.count('if(')
-        complexity += source_code.count('if (')
-        complexity += source_code.count('else if')
-        complexity += source_code.count('else ')
-        complexity += source_code.count('for(')
-        complexity += source_code.count('for (')
-        complexity += source_code.count('while(')
-        complexity += source_code.count('while (')
-        complexity += source_code.count('case ')
-        complexity += source_code.count('catch ')
-        complexity += source_code.count('&&')
-        complexity += source_code.count('||')
-        complexity += source_code.count('?')  # Ternary operator
+        complexity += sum(source_code.count(keyword) for keyword in _CONTROL_FLOW_KEYWORDS)
         
         # Normalize by number of functions
-        functions = self._extract_functions(source_code)
-        if functions:
-            complexity = complexity / len(functions)
+        if function_count:
+            complexity = complexity / function_count
         
         return round(complexity, 2)
     
-    def _check_common_issues(self, source_code: str) -> list:
+    def _check_common_issues(self, source_code: str, line_index: LineIndex) -> Iterator[Issue]:
         """Check for common JavaScript issues."""
-        issues = []
-        lines = source_code.split('\n')
+        # Report in line order, checks in the order below within a line
+        return in_line_order(heapq.merge(
+            self._token_entries(source_code, line_index),
+            self._empty_catch_entries(source_code, line_index),
+            key=itemgetter(0)
+        ))
+    
+    def _token_entries(
+        self,
+        source_code: str,
+        line_index: LineIndex
+    ) -> Iterator[Tuple[int, int, Issue]]:
+        """Yield (line, order, issue) entries for the common-issue tokens."""
+        reported = {}  # kind -> last line seen, one issue per kind per line
         
-        for i, line in enumerate(lines, 1):
-            # Check for var usage (should use let/const)
-            if re.search(r'\bvar\s+\w+', line):
-                issues.append({
-                    'line': i,
-                    'message': 'Use const or let instead of var',
-                    'severity': 'medium',
-                    'type': 'modern_js'
-                })
+        for match in _RE_COMMON_TOKENS.finditer(source_code):
+            kind = match.lastgroup
+            if kind is None:
+                continue
+            line_no = line_index.line_of(match.start())
+            if reported.get(kind) == line_no:
+                continue
+            reported[kind] = line_no
             
-            # Check for == instead of ===
-            if '==' in line and '===' not in line and '!==' not in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Use === instead of == for comparison',
-                    'severity': 'medium',
-                    'type': 'best_practice'
-                })
+            # '==' only counts on lines without any strict comparison
+            if kind == 'loose_equality' and (
+                    line_index.line_contains(line_no, '===')
+                    or line_index.line_contains(line_no, '!==')):
+                continue
             
-            # Check for console.log (should be removed in production)
-            if 'console.log' in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Remove console.log statements before production',
-                    'severity': 'low',
-                    'type': 'cleanup'
-                })
-            
-            # Check for eval() usage (dangerous)
-            if 'eval(' in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Avoid using eval() - potential security risk',
-                    'severity': 'critical',
-                    'type': 'security'
-                })
-            
-            # Check for empty catch blocks
-            if 'catch' in line:
-                # Look ahead for empty block
-                if i < len(lines):
-                    next_lines = ' '.join(lines[i:min(i+3, len(lines))]).strip()
-                    if 'catch' in next_lines and '{}' in next_lines:
-                        issues.append({
-                            'line': i,
-                            'message': 'Empty catch block - handle errors properly',
-                            'severity': 'high',
-                            'type': 'error_handling'
-                        })
-        
-        return issues
+            order, message, severity, issue_type = _COMMON_ISSUES[kind]
+            yield line_no, order, Issue(
+                line=line_no,
+                message=message,
+                severity=severity,
+                type=issue_type
+            )
     
-    def _check_best_practices(self, source_code: str) -> list:
+    def _empty_catch_entries(
+        self,
+        source_code: str,
+        line_index: LineIndex
+    ) -> Iterator[Tuple[int, int, Issue]]:
+        """Yield (line, order, issue) entries for empty catch blocks, on the 'catch' line."""
+        order, message, severity, issue_type = _EMPTY_CATCH_ISSUE
+        last_line = None
+        for match in _RE_EMPTY_CATCH.finditer(source_code):
+            line_no = line_index.line_of(match.start())
+            if line_no != last_line:
+                last_line = line_no
+                yield line_no, order, Issue(
+                    line=line_no,
+                    message=message,
+                    severity=severity,
+                    type=issue_type
+                )
+    
+    def _check_best_practices(self, source_code: str, line_index: LineIndex) -> Iterator[Issue]:
         """Check for JavaScript best practices."""
-        issues = []
-        lines = source_code.split('\n')
+        # Check for magic numbers
+        magic_numbers = (
+            Issue(
+                line=line_index.line_of(match.start()),
+                message='Magic number detected - use named constants',
+                severity='low',
+                type='maintainability'
+            )
+            for match in _LINE_MAGIC_NUMBER.finditer(source_code)
+        )
         
-        for i, line in enumerate(lines, 1):
-            # Check for magic numbers
-            magic_number = re.search(r'\b\d{3,}\b', line)
-            if magic_number and 'const' not in line and 'let' not in line:
-                issues.append({
-                    'line': i,
-                    'message': 'Magic number detected - use named constants',
-                    'severity': 'low',
-                    'type': 'maintainability'
-                })
-            
-            # Check for single letter variable names (except i, j, k in loops)
-            if 'for' not in line:
-                single_var = re.search(r'\b(?:const|let|var)\s+([a-hln-z])\s*=', line)
-                if single_var:
-                    issues.append({
-                        'line': i,
-                        'message': f"Single letter variable '{single_var.group(1)}' - use descriptive names",
-                        'severity': 'low',
-                        'type': 'readability'
-                    })
+        # Check for single letter variable names (except i, j, k in loops)
+        single_letter_vars = (
+            Issue(
+                line=line_index.line_of(match.start()),
+                message=f"Single letter variable '{match.group(1)}' - use descriptive names",
+                severity='low',
+                type='readability'
+            )
+            for match in _LINE_SINGLE_LETTER_VAR.finditer(source_code)
+        )
         
-        return issues
\ No newline at end of file
+        # Report in line order, checks in the order above within a line
+        return heapq.merge(magic_numbers, single_letter_vars, key=attrgetter('line'))
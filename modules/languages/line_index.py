@@ -0,0 +1,74 @@
+"""
+Offset-to-line lookup for whole-source regex scans
+"""
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, Tuple
+import re
+
+
+_RE_NEWLINE = re.compile(r'\n')
+
+
+class LineIndex:
+    """Maps character offsets in a source string to 1-based line numbers."""
+
+    def __init__(self, source_code: str):
+        """
+        Index the newline positions of a source string.
+
+        Args:
+            source_code: Source code string
+        """
+        self.source_code = source_code
+        self.newline_offsets: List[int] = [
+            match.start() for match in _RE_NEWLINE.finditer(source_code)
+        ]
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counted the same way as len(source.split('\\n'))."""
+        return len(self.newline_offsets) + 1
+
+    def line_of(self, offset: int) -> int:
+        """Get the 1-based line number containing a character offset."""
+        return bisect_left(self.newline_offsets, offset) + 1
+
+    def line_span(self, line_no: int) -> Tuple[int, int]:
+        """Get the (start, end) offsets of a line, excluding its newline."""
+        start = self.newline_offsets[line_no - 2] + 1 if line_no > 1 else 0
+        if line_no <= len(self.newline_offsets):
+            end = self.newline_offsets[line_no - 1]
+        else:
+            end = len(self.source_code)
+        return start, end
+
+    def line_contains(self, line_no: int, text: str) -> bool:
+        """Check whether a line contains a substring, without slicing it out."""
+        start, end = self.line_span(line_no)
+        return self.source_code.find(text, start, end) != -1
+
+
+def in_line_order(entries: Iterable[Tuple[int, int, Any]]) -> Iterator[Any]:
+    """
+    Stream items from (line, order, item) entries in (line, order) order.
+
+    Entries must arrive with non-decreasing line numbers, as they do from a
+    finditer scan; only one line's entries are buffered at a time.
+
+    Args:
+        entries: (line number, check order within the line, item) tuples
+
+    Yields:
+        The items, sorted by check order within each line
+    """
+    pending: List[Tuple[int, int, Any]] = []
+    for entry in entries:
+        if pending and entry[0] != pending[0][0]:
+            pending.sort(key=itemgetter(1))
+            yield from (item for _, _, item in pending)
+            pending.clear()
+        pending.append(entry)
+
+    pending.sort(key=itemgetter(1))
+    yield from (item for _, _, item in pending)
@@ -0,0 +1,114 @@
+"""
+Content-addressed cache for language handler parse results
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+import hashlib
+import os
+import pickle
+import sys
+
+# Entries kept in memory before the least recently used is evicted
+MAX_CACHED_PARSES = 1024
+
+# Bump when the shape of any handler's parse() output changes, so stale
+# on-disk entries are never loaded
+CACHE_FORMAT_VERSION = 1
+
+
+class ParseCache:
+    """
+    LRU cache of parse() results keyed by the SHA-256 of the source.
+
+    parse() is pure, so the same source always gives the same result and a
+    changed file simply hashes to a new key. Cached results are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = MAX_CACHED_PARSES, cache_dir: Optional[str] = None):
+        """
+        Create a parse cache.
+
+        Args:
+            maxsize: Maximum number of in-memory entries
+            cache_dir: Directory for pickled entries; None keeps the cache in memory only
+        """
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    def get_or_parse(self, language: str, source_code: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Return the cached parse result for a source, parsing it on a miss.
+
+        Args:
+            language: Handler language, kept in the key so handlers never share entries
+            source_code: Source code string
+            parse: Uncached parse function
+
+        Returns:
+            Parse result
+        """
+        digest = hashlib.sha256(source_code.encode('utf-8', 'surrogatepass')).hexdigest()
+        key = (language, digest)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        parsed = self._load(language, digest)
+        if parsed is None:
+            parsed = parse(source_code)
+            self._store(language, digest, parsed)
+
+        self._entries[key] = parsed
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return parsed
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (on-disk entries are kept)."""
+        self._entries.clear()
+
+    def _disk_path(self, cache_dir: str, language: str, digest: str) -> str:
+        """Get the pickle path for an entry in a (configured) cache directory."""
+        python_version = f'py{sys.version_info[0]}{sys.version_info[1]}'
+        filename = f'{language}-v{CACHE_FORMAT_VERSION}-{python_version}-{digest}.pkl'
+        return os.path.join(cache_dir, filename)
+
+    def _load(self, language: str, digest: str) -> Any:
+        """Load an entry from disk, or None when absent or unreadable."""
+        cache_dir = self.cache_dir
+        if not cache_dir:
+            return None
+
+        try:
+            with open(self._disk_path(cache_dir, language, digest), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _store(self, language: str, digest: str, parsed: Any) -> None:
+        """Write an entry to disk; failures only cost a future re-parse."""
+        cache_dir = self.cache_dir
+        if not cache_dir:
+            return
+
+        path = self._disk_path(cache_dir, language, digest)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠ Could not write parse cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# Shared by all handlers; set IRMS_PARSE_CACHE_DIR to also persist entries
+# across runs (e.g. ~/.cache/irms/parse)
+PARSE_CACHE = ParseCache(cache_dir=os.environ.get('IRMS_PARSE_CACHE_DIR'))
@@ -2,6 +2,7 @@
 Python language handler for IRMS
 """
 from modules.languages.base import BaseLanguageHandler
+from modules.languages.parse_cache import PARSE_CACHE
 from modules.code_analyzer import CodeAnalyzer
 from modules.change_detector import ChangeDetector
 import ast
@@ -15,12 +16,18 @@ class PythonHandler(BaseLanguageHandler):
         """
         Parse Python source code into AST.
         
+        Results are cached by source content, see parse_cache.
+        
         Args:
             source_code: Python source code string
             
         Returns:
             AST Module
         """
+        return PARSE_CACHE.get_or_parse('python', source_code, self._parse)
+
+    def _parse(self, source_code: str) -> ast.Module:
+        """Parse Python source code without the cache."""
         return ast.parse(source_code)
 
     def analyze(self, tree: Any, source_code: str) -> Dict:
@@ -0,0 +1,54 @@
+"""
+Tests for the C/C++ language handler
+"""
+import unittest
+
+from modules.languages.cpp_handler import CppHandler
+
+
+# Class with an indented constructor and destructor, which have no return type
+CLASS_SOURCE = """#include <iostream>
+class Point {
+public:
+    Point() {
+        x = 0;
+    }
+    ~Point() {
+    }
+    int get() const {
+        return x;
+    }
+private:
+    int x;
+};
+static int helper(int a) {
+    return a;
+}
+int main() {
+    Point p;
+    return helper(p.get());
+}
+"""
+
+
+class CppHandlerFunctionsTest(unittest.TestCase):
+    """Function extraction from C/C++ sources."""
+
+    def setUp(self):
+        self.handler = CppHandler()
+
+    def test_indented_constructor_and_destructor(self):
+        functions = self.handler.parse(CLASS_SOURCE)['functions']
+        self.assertEqual(functions, ['Point', '~Point', 'get', 'helper', 'main'])
+
+    def test_control_keywords_are_not_functions(self):
+        source = "int main() {\n    if (x) {\n    }\n    while (y) {\n    }\n}\n"
+        self.assertEqual(self.handler.parse(source)['functions'], ['main'])
+
+    def test_commented_out_definitions_are_skipped(self):
+        source = "// void fake() {\n    /* Fake() { */\nint main() {\n}\n"
+        self.assertEqual(self.handler.parse(source)['functions'], ['main'])
+
+
+if __name__ == '__main__':
+    unittest.main()
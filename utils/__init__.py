@@ -4,6 +4,8 @@ Utility modules for IRMS
 from .pdf_parser import extract_text_from_pdf, extract_text_from_txt
 from .ast_helper import (
     parse_python_file,
+    parse_many,
+    extract_all,
     get_function_info,
     get_class_info,
     get_imports,
@@ -14,6 +16,8 @@ __all__ = [
     'extract_text_from_pdf',
     'extract_text_from_txt',
     'parse_python_file',
+    'parse_many',
+    'extract_all',
     'get_function_info',
     'get_class_info',
     'get_imports',
@@ -1,48 +1,127 @@
 """
 PDF and text file parsing utilities
 """
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+import mmap
+import os
+
+# PyMuPDF extracts text in C++ and is much faster than PyPDF2; PyPDF2
+# remains the fallback when it is not installed
+try:
+    import pymupdf as fitz
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24.3
+        PYMUPDF_AVAILABLE = True
+    except ImportError:
+        PYMUPDF_AVAILABLE = False
 
 try:
     import PyPDF2
-    PDF_AVAILABLE = True
+    PYPDF2_AVAILABLE = True
 except ImportError:
-    PDF_AVAILABLE = False
+    PYPDF2_AVAILABLE = False
+
+PDF_AVAILABLE = PYMUPDF_AVAILABLE or PYPDF2_AVAILABLE
+
+try:
+    import charset_normalizer
+    CHARSET_DETECTION_AVAILABLE = True
+except ImportError:
+    CHARSET_DETECTION_AVAILABLE = False
+
+# PDFs with fewer pages are extracted in-process; below this, starting
+# worker processes costs more than it saves
+PARALLEL_PDF_MIN_PAGES = 32
 
+# Bytes of a non-UTF-8 text file used to detect its encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
 
-def extract_text_from_pdf(pdf_path: Path) -> Optional[str]:
+
+def extract_text_from_pdf(pdf_path: Path, max_workers: Optional[int] = None) -> Optional[str]:
     """
     Extract text content from a PDF file.
     
+    PDFs with at least PARALLEL_PDF_MIN_PAGES pages are split into page
+    ranges extracted by worker processes (text extraction is CPU-bound,
+    and PyMuPDF documents must not be shared between threads).
+    
     Args:
         pdf_path: Path to PDF file
+        max_workers: Worker processes for large PDFs, defaults to the CPU count
         
     Returns:
         Extracted text or None if extraction fails
     """
     if not PDF_AVAILABLE:
-        print(f"⚠ PyPDF2 not available, skipping {pdf_path.name}")
+        print(f"⚠ PyMuPDF/PyPDF2 not available, skipping {pdf_path.name}")
         return None
     
+    workers = max_workers or os.cpu_count() or 1
+    
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text_parts = []
-            
-            for page in pdf_reader.pages:
-                text_parts.append(page.extract_text())
-            
-            return '\n'.join(text_parts)
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+                if page_count < PARALLEL_PDF_MIN_PAGES or workers < 2:
+                    return '\n'.join(page.get_text() for page in doc)
+        else:
+            with _map_pdf(pdf_path) as pdf_map:
+                pdf_reader = PyPDF2.PdfReader(pdf_map)
+                page_count = len(pdf_reader.pages)
+                if page_count < PARALLEL_PDF_MIN_PAGES or workers < 2:
+                    return '\n'.join(page.extract_text() for page in pdf_reader.pages)
+        
+        # Contiguous page ranges, one per worker, joined back in page order
+        pages_per_worker = -(-page_count // workers)
+        ranges = [
+            (pdf_path, start, min(start + pages_per_worker, page_count))
+            for start in range(0, page_count, pages_per_worker)
+        ]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            return '\n'.join(pool.map(_extract_page_range, ranges))
     except Exception as e:
         print(f"⚠ Error reading PDF {pdf_path.name}: {e}")
         return None
 
 
+def _extract_page_range(page_range: Tuple[Path, int, int]) -> str:
+    """Extract the text of pages [start, stop) of a PDF in a worker."""
+    pdf_path, start, stop = page_range
+    
+    if PYMUPDF_AVAILABLE:
+        with fitz.open(pdf_path) as doc:
+            return '\n'.join(doc[number].get_text() for number in range(start, stop))
+    
+    with _map_pdf(pdf_path) as pdf_map:
+        pdf_reader = PyPDF2.PdfReader(pdf_map)
+        return '\n'.join(pdf_reader.pages[number].extract_text() for number in range(start, stop))
+
+
+def _map_pdf(pdf_path: Path) -> mmap.mmap:
+    """
+    Memory-map a PDF read-only for PyPDF2.
+    
+    PyPDF2 seeks back and forth through the file; the map serves those reads
+    straight from the page cache (shared by all workers) instead of through
+    per-reader file buffers. PyMuPDF is given the path instead, as it copies
+    any stream it is handed.
+    """
+    with open(pdf_path, 'rb') as file:
+        # The map stays valid after the file is closed
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def extract_text_from_txt(txt_path: Path) -> Optional[str]:
     """
     Extract text content from a text file.
     
+    The file is read once; non-UTF-8 content is decoded with the encoding
+    charset_normalizer detects (when installed), else as latin-1.
+    
     Args:
         txt_path: Path to text file
         
@@ -50,16 +129,34 @@ def extract_text_from_txt(txt_path: Path) -> Optional[str]:
         File content or None if read fails
     """
     try:
-        with open(txt_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except UnicodeDecodeError:
-        # Try with different encoding
-        try:
-            with open(txt_path, 'r', encoding='latin-1') as file:
-                return file.read()
-        except Exception as e:
-            print(f"⚠ Error reading text file {txt_path.name}: {e}")
-            return None
+        with open(txt_path, 'rb') as file:
+            data = file.read()
     except Exception as e:
         print(f"⚠ Error reading text file {txt_path.name}: {e}")
-        return None
\ No newline at end of file
+        return None
+    
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = _decode_non_utf8(data)
+    
+    # Match text-mode universal newline handling
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    
+    return text
+
+
+def _decode_non_utf8(data: bytes) -> str:
+    """Decode bytes that are not UTF-8, detecting the encoding from the head."""
+    if CHARSET_DETECTION_AVAILABLE:
+        best = charset_normalizer.from_bytes(data[:ENCODING_SAMPLE_SIZE]).best()
+        if best is not None:
+            try:
+                return data.decode(best.encoding)
+            except (UnicodeDecodeError, LookupError):
+                # The sample did not represent the whole file
+                pass
+    
+    # latin-1 maps every byte, so this always succeeds
+    return data.decode('latin-1')